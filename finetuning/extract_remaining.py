@@ -9,30 +9,34 @@ for chunk_id in [1, 2, 4, 5]:
     chunk_file = os.path.join(DATA, f"remaining_chunk_{chunk_id}.jsonl")
     resp_file = os.path.join(DATA, f"responses_chunk_{chunk_id}.jsonl")
 
-    # Load all prompts for this chunk
-    all_prompts = []
-    with open(chunk_file) as f:
-        for line in f:
-            all_prompts.append(json.loads(line.strip()))
-
     # Load completed prompts
     done = set()
     if os.path.exists(resp_file):
         with open(resp_file) as f:
             for line in f:
                 try:
-                    item = json.loads(line.strip())
+                    item = json.loads(line)
                     done.add(item["prompt"])
                 except:
                     pass
 
-    remaining = [p for p in all_prompts if p["prompt"] not in done]
+    # Stream the chunk, copying lines that still need a response straight
+    # through (chunk files are already one json.dumps object per line)
+    out = os.path.join(DATA, f"todo_chunk_{chunk_id}.jsonl")
+    remaining = 0
+    g = None
+    with open(chunk_file) as f:
+        for line in f:
+            if json.loads(line)["prompt"] in done:
+                continue
+            if g is None:
+                g = open(out, "w")
+            g.write(line)
+            remaining += 1
+    if g is not None:
+        g.close()
 
     if remaining:
-        out = os.path.join(DATA, f"todo_chunk_{chunk_id}.jsonl")
-        with open(out, "w") as f:
-            for p in remaining:
-                f.write(json.dumps(p) + "\n")
-        print(f"Chunk {chunk_id}: {len(done)} done, {len(remaining)} remaining -> {out}")
+        print(f"Chunk {chunk_id}: {len(done)} done, {remaining} remaining -> {out}")
     else:
         print(f"Chunk {chunk_id}: ALL DONE ({len(done)})")
@@ -2,6 +2,14 @@
 """Combine prompts + raw responses into ChatML JSONL training data."""
 import json
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
 SYSTEM_PROMPT = """You are a lamp programmer. You control a 172-LED lamp (10x14 front grid + 32 ambient back LEDs). Output ONLY a JSON light program. No text, no explanation.
 
 ## Commands (use inside step.command):
@@ -55,13 +63,17 @@ User: "show a heart"
 
 USER_TEMPLATE = "Create a light program for this request.\n\nRequest: {prompt}\n\nRespond with ONLY a JSON program. No text."
 
+# The system message is the same on every line, so serialize it once and splice
+# it in; each line is still byte-identical to json.dumps(entry).
+SYSTEM_MESSAGE_JSON = json.dumps({"role": "system", "content": SYSTEM_PROMPT})
+
 # Read prompts
 prompts = []
 with open("finetuning/data/prompts_v2_chunk2.jsonl") as f:
     for line in f:
         line = line.strip()
         if line:
-            data = json.loads(line)
+            data = json_loads(line)
             prompts.append(data["prompt"])
 
 # Read raw responses (one JSON program per line)
@@ -84,17 +96,12 @@ with open("finetuning/data/responses_v2_agent2.jsonl", "w") as f:
         response = responses[i]
         # Validate response JSON
         try:
-            json.loads(response)
+            json_loads(response)
         except json.JSONDecodeError as e:
             print(f"Line {i+1} INVALID JSON for '{prompt[:50]}': {e}")
             continue
-        entry = {
-            "conversations": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": USER_TEMPLATE.format(prompt=prompt)},
-                {"role": "assistant", "content": response}
-            ]
-        }
-        f.write(json.dumps(entry) + "\n")
+        f.write('{"conversations": [' + SYSTEM_MESSAGE_JSON
+                + ', {"role": "user", "content": ' + json.dumps(USER_TEMPLATE.format(prompt=prompt))
+                + '}, {"role": "assistant", "content": ' + json.dumps(response) + '}]}\n')
 
 print(f"Formatted {count} training examples to responses_v2_agent2.jsonl")
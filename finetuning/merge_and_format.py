@@ -3,12 +3,24 @@
 Merge all v2 response files, deduplicate, validate, and create final training data.
 Combines with existing v1 data to produce the full 7,500-example dataset.
 """
+import argparse
 import json
 import os
-import re
 import random
 import sys
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    HAS_DATASKETCH = True
+except ImportError:
+    HAS_DATASKETCH = False
+
 DATA = os.path.join(os.path.dirname(__file__), "data")
 
 # Import system prompt
@@ -20,7 +32,11 @@ USER_TEMPLATE = "Create a light program for this request.\n\nRequest: {input}\n\
 VALID_PATTERN_NAMES = {"solid", "gradient", "breathing", "wave", "rainbow", "pulse", "sparkle"}
 VALID_COMMAND_TYPES = {"pattern", "render", "stop"}
 VALID_ELEMENT_TYPES = {"fill", "text", "pixel", "rect", "line"}
-HEX_RE = re.compile(r'^#([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$')
+
+# Parse with orjson when available; its JSONDecodeError subclasses json's, so
+# the except clauses below catch both. Output still goes through json.dumps to
+# keep the written files byte-identical.
+json_loads = orjson.loads if HAS_ORJSON else json.loads
 
 
 def validate_program(data):
@@ -73,18 +89,18 @@ def load_chunk_responses(filepath):
             if not line:
                 continue
             try:
-                item = json.loads(line)
+                item = json_loads(line)
                 prompt = item["prompt"]
                 resp_str = item["response"]
 
                 # Parse the response to validate
-                resp_data = json.loads(resp_str) if isinstance(resp_str, str) else resp_str
+                resp_data = json_loads(resp_str) if isinstance(resp_str, str) else resp_str
                 valid, reason = validate_program(resp_data)
 
                 if valid:
                     # Re-compact
                     compact = json.dumps(resp_data, separators=(',', ':'))
-                    pairs.append((prompt, compact))
+                    pairs.append((prompt, compact, resp_data))
                 else:
                     errors += 1
             except (json.JSONDecodeError, KeyError) as e:
@@ -102,13 +118,13 @@ def load_pairs_format(filepath):
             if not line:
                 continue
             try:
-                item = json.loads(line)
+                item = json_loads(line)
                 prompt = item["p"]
                 resp_data = item["r"]
                 valid, reason = validate_program(resp_data)
                 if valid:
                     compact = json.dumps(resp_data, separators=(',', ':'))
-                    pairs.append((prompt, compact))
+                    pairs.append((prompt, compact, resp_data))
                 else:
                     errors += 1
             except (json.JSONDecodeError, KeyError):
@@ -116,6 +132,43 @@ def load_pairs_format(filepath):
     return pairs, errors
 
 
+def near_dedup(pairs, threshold, num_perm=128):
+    """Drop pairs whose prompt is a near-duplicate of an earlier one.
+
+    Prompts are shingled into character 3-grams and compared with MinHash LSH
+    at the given Jaccard threshold; the first occurrence is kept.
+    """
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    kept = []
+    for i, (prompt, response, resp_data) in enumerate(pairs):
+        text = prompt.strip().lower()
+        mh = MinHash(num_perm=num_perm)
+        for j in range(max(len(text) - 2, 1)):
+            mh.update(text[j:j + 3].encode())
+        if lsh.query(mh):
+            continue
+        lsh.insert(i, mh)
+        kept.append((prompt, response, resp_data))
+    return kept
+
+
+def cap_per_program(pairs, max_per_program):
+    """Keep at most max_per_program pairs per distinct response program.
+
+    Programs are compared in canonical form (sorted keys, compact), so key
+    order and whitespace differences don't hide a repeat.
+    """
+    counts = {}
+    kept = []
+    for pair in pairs:
+        key = json.dumps(pair[2], sort_keys=True, separators=(',', ':'))
+        n = counts.get(key, 0)
+        if n < max_per_program:
+            counts[key] = n + 1
+            kept.append(pair)
+    return kept
+
+
 def format_training_example(prompt, response):
     """Format as training conversation."""
     return {
@@ -128,12 +181,23 @@ def format_training_example(prompt, response):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Merge v2 responses and create final training data")
+    parser.add_argument("--near-dedup", type=float, default=None, metavar="THRESHOLD",
+                        help="Also drop near-duplicate v2 prompts (MinHash Jaccard threshold, e.g. 0.87; needs datasketch)")
+    parser.add_argument("--max-per-program", type=int, default=None, metavar="N",
+                        help="Keep at most N v2 pairs that share an identical response program")
+    args = parser.parse_args()
+
+    if args.near_dedup is not None and not HAS_DATASKETCH:
+        print("  ERROR: --near-dedup requires datasketch (pip install datasketch)")
+        sys.exit(1)
+
     print("=" * 60)
     print("  MERGING AND FORMATTING TRAINING DATA")
     print("=" * 60)
 
     # --- Load all v2 response files ---
-    all_pairs = []  # (prompt, response_str)
+    all_pairs = []  # (prompt, response_str, parsed response)
     total_errors = 0
 
     # Chunk response files
@@ -167,14 +231,18 @@ def main():
 
     # --- Deduplicate by prompt ---
     seen = {}
-    for prompt, response in all_pairs:
-        prompt_lower = prompt.strip().lower()
+    for pair in all_pairs:
+        prompt_lower = pair[0].strip().lower()
         if prompt_lower not in seen:
-            seen[prompt_lower] = (prompt, response)
+            seen[prompt_lower] = pair
 
     v2_pairs = list(seen.values())
     print(f"  After dedup: {len(v2_pairs)} unique v2 pairs")
 
+    if args.near_dedup is not None:
+        v2_pairs = near_dedup(v2_pairs, args.near_dedup)
+        print(f"  After near-dup removal (Jaccard >= {args.near_dedup}): {len(v2_pairs)} v2 pairs")
+
     # --- Load existing v1 training data ---
     v1_train_path = os.path.join(DATA, "train.jsonl")
     v1_val_path = os.path.join(DATA, "val.jsonl")
@@ -185,7 +253,7 @@ def main():
         if os.path.exists(path):
             with open(path) as f:
                 for line in f:
-                    item = json.loads(line.strip())
+                    item = json_loads(line)
                     v1_examples.append(item)
                     # Extract prompt from user message
                     for conv in item["conversations"]:
@@ -199,52 +267,61 @@ def main():
     print(f"  Existing v1 examples: {len(v1_examples)}")
 
     # --- Remove v2 pairs that overlap with v1 ---
-    v2_filtered = [(p, r) for p, r in v2_pairs if p.strip().lower() not in v1_prompts]
+    v2_filtered = [pair for pair in v2_pairs if pair[0].strip().lower() not in v1_prompts]
     print(f"  v2 after removing v1 overlaps: {len(v2_filtered)}")
 
-    # --- Format v2 as training examples ---
-    v2_examples = [format_training_example(p, r) for p, r in v2_filtered]
+    if args.max_per_program is not None:
+        v2_filtered = cap_per_program(v2_filtered, args.max_per_program)
+        print(f"  v2 after capping repeated programs at {args.max_per_program}: {len(v2_filtered)}")
 
     # --- Combine all ---
-    all_examples = v1_examples + v2_examples
-    print(f"\n  Combined total: {len(all_examples)}")
+    # v2 examples are formatted on demand while writing; only the order is held
+    n_v1 = len(v1_examples)
+    total = n_v1 + len(v2_filtered)
+    print(f"\n  Combined total: {total}")
+
+    def example(i):
+        if i < n_v1:
+            return v1_examples[i]
+        p, r, _ = v2_filtered[i - n_v1]
+        return format_training_example(p, r)
 
     # --- Shuffle and split 90/10 ---
+    # Shuffling indices gives the same order as shuffling the examples themselves
+    order = list(range(total))
     random.seed(42)
-    random.shuffle(all_examples)
+    random.shuffle(order)
 
-    split_idx = int(len(all_examples) * 0.9)
-    train = all_examples[:split_idx]
-    val = all_examples[split_idx:]
+    split_idx = int(total * 0.9)
+    train = order[:split_idx]
+    val = order[split_idx:]
 
     # --- Save ---
     train_out = os.path.join(DATA, "train_v2.jsonl")
     val_out = os.path.join(DATA, "val_v2.jsonl")
 
     with open(train_out, "w") as f:
-        for ex in train:
-            f.write(json.dumps(ex) + "\n")
+        f.writelines(json.dumps(example(i)) + "\n" for i in train)
 
     with open(val_out, "w") as f:
-        for ex in val:
-            f.write(json.dumps(ex) + "\n")
+        f.writelines(json.dumps(example(i)) + "\n" for i in val)
 
     print(f"\n{'=' * 60}")
     print(f"  FINAL OUTPUT")
     print(f"{'=' * 60}")
     print(f"  Training set:   {len(train)} examples -> {train_out}")
     print(f"  Validation set: {len(val)} examples -> {val_out}")
-    print(f"  Total:          {len(all_examples)} examples")
+    print(f"  Total:          {total} examples")
     print(f"{'=' * 60}")
 
     # --- Category distribution of v2 ---
-    # Quick check: how many of each command type in v2
+    # Quick check: how many of each command type in v2 (reuses the programs
+    # parsed during validation)
     pattern_count = 0
     render_count = 0
     multi_step_count = 0
-    for p, r in v2_filtered:
+    for _, _, data in v2_filtered:
         try:
-            data = json.loads(r)
             steps = data.get("program", {}).get("steps", [])
             if len(steps) > 1:
                 multi_step_count += 1
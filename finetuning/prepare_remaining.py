@@ -3,13 +3,21 @@
 import json
 import os
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
 DATA = os.path.join(os.path.dirname(__file__), "data")
 
 # Load all prompts
 all_prompts = []
 with open(os.path.join(DATA, "prompts_v2.jsonl")) as f:
     for line in f:
-        all_prompts.append(json.loads(line.strip()))
+        all_prompts.append(json_loads(line))
 
 print(f"Total v2 prompts: {len(all_prompts)}")
 
@@ -20,20 +28,24 @@ done_prompts = set()
 for fname in ["responses_v2_agent4.jsonl", "responses_v2_agent5.jsonl"]:
     path = os.path.join(DATA, fname)
     if os.path.exists(path):
+        n = 0
         with open(path) as f:
             for line in f:
-                item = json.loads(line.strip())
+                item = json_loads(line)
                 done_prompts.add(item["prompt"])
-        print(f"  {fname}: {sum(1 for _ in open(path))} entries")
+                n += 1
+        print(f"  {fname}: {n} entries")
 
 # pairs_agent3.jsonl uses {"p": "...", "r": {...}}
 path = os.path.join(DATA, "pairs_agent3.jsonl")
 if os.path.exists(path):
+    n = 0
     with open(path) as f:
         for line in f:
-            item = json.loads(line.strip())
+            item = json_loads(line)
             done_prompts.add(item["p"])
-    print(f"  pairs_agent3.jsonl: {sum(1 for _ in open(path))} entries")
+            n += 1
+    print(f"  pairs_agent3.jsonl: {n} entries")
 
 print(f"\nAlready completed: {len(done_prompts)}")
 
@@ -60,8 +72,7 @@ for i in range(5):
 for i, chunk in enumerate(chunks):
     out_path = os.path.join(DATA, f"remaining_chunk_{i+1}.jsonl")
     with open(out_path, "w") as f:
-        for item in chunk:
-            f.write(json.dumps(item) + "\n")
+        f.writelines(json.dumps(item) + "\n" for item in chunk)
     # Category breakdown per chunk
     chunk_cats = {}
     for p in chunk:
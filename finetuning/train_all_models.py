@@ -10,8 +10,9 @@ import json
 import os
 import time
 import gc
+import threading
 import torch
-from datasets import Dataset
+from datasets import load_dataset
 
 # ─── Model configs ───────────────────────────────────────────────────────────
 
@@ -21,18 +22,24 @@ MODELS = {
         "output_name": "lamp-llama-3b",
         "max_seq_length": 4096,
         "stop_token": "<|eot_id|>",
+        "instruction_part": "<|start_header_id|>user<|end_header_id|>\n\n",
+        "response_part": "<|start_header_id|>assistant<|end_header_id|>\n\n",
     },
     "gemma": {
         "model_name": "unsloth/gemma-3-4b-it",
         "output_name": "lamp-gemma-4b",
         "max_seq_length": 4096,
         "stop_token": "<end_of_turn>",
+        "instruction_part": "<start_of_turn>user\n",
+        "response_part": "<start_of_turn>model\n",
     },
     "phi": {
         "model_name": "unsloth/Phi-4-mini-instruct",
         "output_name": "lamp-phi-mini",
         "max_seq_length": 4096,
         "stop_token": "<|endoftext|>",
+        "instruction_part": "<|user|>",
+        "response_part": "<|assistant|>",
     },
 }
 
@@ -41,11 +48,12 @@ MODELS = {
 TRAIN_CONFIG = {
     "per_device_train_batch_size": 8,
     "gradient_accumulation_steps": 2,  # effective batch = 16
+    "group_by_length": True,  # batch similar-length rows to cut padding
     "warmup_ratio": 0.05,
     "num_train_epochs": 3,
     "learning_rate": 2e-4,
     "logging_steps": 10,
-    "optim": "adamw_8bit",
+    "optim": "adamw_torch_fused",  # LoRA optimizer state is small; no need for 8-bit
     "weight_decay": 0.01,
     "lr_scheduler_type": "cosine",
     "seed": 42,
@@ -70,14 +78,15 @@ LORA_CONFIG = {
 
 # ─── Data loading ────────────────────────────────────────────────────────────
 
-def read_jsonl(path):
+def read_first_jsonl(path):
     with open(path) as f:
-        return [json.loads(line) for line in f]
+        return json.loads(f.readline())
 
 
 def load_data():
-    train = Dataset.from_list(read_jsonl("data/train.jsonl"))
-    val = Dataset.from_list(read_jsonl("data/val.jsonl"))
+    # Arrow's JSON reader parses straight into columns, no per-row Python dicts
+    ds = load_dataset("json", data_files={"train": "data/train.jsonl", "validation": "data/val.jsonl"})
+    train, val = ds["train"], ds["validation"]
     print(f"Dataset: {len(train)} train, {len(val)} val")
     return train, val
 
@@ -130,6 +139,7 @@ def quick_eval(model, tokenizer, system_prompt):
 
 def train_model(key, config):
     from unsloth import FastLanguageModel
+    from unsloth.chat_templates import train_on_responses_only
     from trl import SFTTrainer, SFTConfig
 
     print(f"\n{'='*60}")
@@ -187,6 +197,14 @@ def train_model(key, config):
         packing=False,
     )
 
+    # Compute loss on the assistant's program only; the 2KB system prompt is the
+    # same on every row and the user turn is input, not something to learn
+    trainer = train_on_responses_only(
+        trainer,
+        instruction_part=config["instruction_part"],
+        response_part=config["response_part"],
+    )
+
     trainer.train()
 
     elapsed = time.time() - start
@@ -194,7 +212,7 @@ def train_model(key, config):
 
     # Quick eval
     print("\n--- Quick Eval ---")
-    system_prompt = read_jsonl("data/train.jsonl")[0]["conversations"][0]["content"]
+    system_prompt = read_first_jsonl("data/train.jsonl")["conversations"][0]["content"]
     quick_eval(model, tokenizer, system_prompt)
 
     # Export GGUF Q8_0 (best quality)
@@ -225,6 +243,18 @@ PARAMETER stop {config['stop_token']}
     return elapsed
 
 
+# ─── Weight prefetch ─────────────────────────────────────────────────────────
+
+def prefetch_weights(model_names):
+    """Download model snapshots into the HF cache so from_pretrained finds them local."""
+    from huggingface_hub import snapshot_download
+    for name in model_names:
+        try:
+            snapshot_download(name)
+        except Exception as e:
+            print(f"  Prefetch of {name} failed ({e}); it will download on load")
+
+
 # ─── Main ────────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -238,6 +268,10 @@ if __name__ == "__main__":
     total_start = time.time()
     results = {}
 
+    # Download the later models while the first one trains
+    later = [config["model_name"] for config in list(MODELS.values())[1:]]
+    threading.Thread(target=prefetch_weights, args=(later,), daemon=True).start()
+
     for key, config in MODELS.items():
         elapsed = train_model(key, config)
         results[key] = elapsed
@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 """Comprehensive verification of the v2 training dataset."""
+import argparse
 import json
 import re
 import sys
 import os
 from collections import Counter
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 DATA = os.path.join(os.path.dirname(__file__), "data")
 
 VALID_PATTERN_NAMES = {"solid", "gradient", "breathing", "wave", "rainbow", "pulse", "sparkle"}
@@ -13,6 +20,10 @@ VALID_COMMAND_TYPES = {"pattern", "render", "stop"}
 VALID_ELEMENT_TYPES = {"fill", "text", "pixel", "rect", "line"}
 HEX_RE = re.compile(r'^#([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$')
 
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so the except
+# clauses below work with either parser
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
 issues = []
 stats = {
     "total": 0,
@@ -29,7 +40,7 @@ stats = {
     "render_element_counts": [],
     "prompt_lengths": [],
     "response_lengths": [],
-    "prompts": [],
+    "prompt_counter": Counter(),
     "render_objects": 0,
     "element_types": Counter(),
     "color_valid": 0,
@@ -65,11 +76,12 @@ def validate_example(idx, item):
 
     # Extract prompt
     user_content = convs[1]["content"]
-    if "Request: " in user_content:
-        prompt = user_content.split("Request: ")[1].split("\n")[0].strip()
+    _, found, rest = user_content.partition("Request: ")
+    if found:
+        prompt = rest.partition("\n")[0].strip()
     else:
         prompt = user_content
-    stats["prompts"].append(prompt)
+    stats["prompt_counter"][prompt.lower().strip()] += 1
     stats["prompt_lengths"].append(len(prompt.split()))
 
     # Parse assistant response
@@ -77,7 +89,7 @@ def validate_example(idx, item):
     stats["response_lengths"].append(len(response_str))
 
     try:
-        resp = json.loads(response_str)
+        resp = json_loads(response_str)
     except json.JSONDecodeError:
         issues.append(f"Line {idx}: assistant response not valid JSON: {response_str[:100]}...")
         return False
@@ -170,6 +182,11 @@ def validate_example(idx, item):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Verify the v2 training dataset")
+    parser.add_argument("--max-issues", type=int, default=None,
+                        help="Stop once this many issues are found; the report covers the lines read so far")
+    args = parser.parse_args()
+
     print("=" * 70)
     print("  DATASET VERIFICATION REPORT")
     print("=" * 70)
@@ -178,18 +195,23 @@ def main():
         path = os.path.join(DATA, filename)
         print(f"\n--- Verifying {filename} ---")
 
+        n_lines = 0
         with open(path) as f:
-            lines = f.readlines()
-
-        print(f"  Lines: {len(lines)}")
-
-        for i, line in enumerate(lines):
-            stats["total"] += 1
-            try:
-                item = json.loads(line.strip())
-                validate_example(i + 1, item)
-            except json.JSONDecodeError:
-                issues.append(f"Line {i+1}: not valid JSONL")
+            for i, line in enumerate(f):
+                n_lines += 1
+                stats["total"] += 1
+                try:
+                    item = json_loads(line)
+                    validate_example(i + 1, item)
+                except json.JSONDecodeError:
+                    issues.append(f"Line {i+1}: not valid JSONL")
+                if args.max_issues is not None and len(issues) >= args.max_issues:
+                    break
+
+        print(f"  Lines: {n_lines}")
+        if args.max_issues is not None and len(issues) >= args.max_issues:
+            print(f"  Stopped early: {len(issues)} issues reached --max-issues {args.max_issues}")
+            break
 
     # Summary
     print(f"\n{'=' * 70}")
@@ -257,13 +279,13 @@ def main():
         print(f"    Max:     {max(stats['response_lengths'])} chars")
 
     # Duplicate check
-    prompt_counts = Counter(p.lower().strip() for p in stats["prompts"])
-    dupes = {p: c for p, c in prompt_counts.items() if c > 1}
+    prompt_counts = stats["prompt_counter"]
+    n_dupes = sum(1 for c in prompt_counts.values() if c > 1)
     print(f"\n  Duplicates:")
     print(f"    Unique prompts:    {len(prompt_counts)}")
-    print(f"    Duplicate prompts: {len(dupes)}")
-    if dupes:
-        top_dupes = sorted(dupes.items(), key=lambda x: -x[1])[:10]
+    print(f"    Duplicate prompts: {n_dupes}")
+    if n_dupes:
+        top_dupes = [(p, c) for p, c in prompt_counts.most_common(10) if c > 1]
         for p, c in top_dupes:
             print(f"      [{c}x] {p[:60]}")
 
@@ -24,6 +24,12 @@ import argparse
 import urllib.request
 import urllib.error
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 LAMP_SERVER_URL = "http://localhost:3001"
 
 # =============================================================================
@@ -693,7 +699,7 @@ TEST_CASES = [
 def send_program(program_data: dict) -> bool:
     """Send a program to the lamp server."""
     try:
-        data = json.dumps(program_data).encode("utf-8")
+        data = orjson.dumps(program_data) if HAS_ORJSON else json.dumps(program_data).encode("utf-8")
         req = urllib.request.Request(
             f"{LAMP_SERVER_URL}/program",
             data=data,